@@ -3,6 +3,13 @@
  */
 
 import algosdk from 'algosdk';
+import crypto from 'crypto';
+
+// Contract action codes (contracts/_common.py)
+const CONTRACT_ACTIONS = {
+  CREATE_POLICY: 0x01,
+  CLAIM_PAYOUT: 0x02
+};
 
 export class AlgorandService {
   constructor() {
@@ -101,17 +108,27 @@ export class AlgorandService {
     try {
       const suggestedParams = await this.algodClient.getTransactionParams().do();
       
+      const startTimestamp = Math.floor(startDate.getTime() / 1000);
+      const endTimestamp = Math.floor(endDate.getTime() / 1000);
+      
+      // Policy metadata hash
+      const metadataHash = crypto
+        .createHash('sha256')
+        .update(`${farmerId}-${cropType}-${coverageAmount}-${startTimestamp}-${endTimestamp}`)
+        .digest();
+      
       // Create application call transaction
       const appCallTxn = algosdk.makeApplicationCallTxnFromObject({
         from: this.oracleAccount.addr,
         appIndex: this.contractId,
         onComplete: algosdk.OnApplicationComplete.NoOpOC,
         appArgs: [
-          new Uint8Array(Buffer.from('create_policy')),
+          new Uint8Array([CONTRACT_ACTIONS.CREATE_POLICY]),
           new Uint8Array(Buffer.from(cropType)),
           algosdk.encodeUint64(coverageAmount),
-          algosdk.encodeUint64(Math.floor(startDate.getTime() / 1000)),
-          algosdk.encodeUint64(Math.floor(endDate.getTime() / 1000))
+          algosdk.encodeUint64(startTimestamp),
+          algosdk.encodeUint64(endTimestamp),
+          new Uint8Array(metadataHash)
         ],
         accounts: [farmerId],
         suggestedParams
@@ -159,7 +176,7 @@ export class AlgorandService {
         appIndex: this.contractId,
         onComplete: algosdk.OnApplicationComplete.NoOpOC,
         appArgs: [
-          new Uint8Array(Buffer.from('claim_payout')),
+          new Uint8Array([CONTRACT_ACTIONS.CLAIM_PAYOUT]),
           algosdk.encodeUint64(payoutAmount),
           new Uint8Array(Buffer.from(weatherDataHash, 'hex'))
         ],
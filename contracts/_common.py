@@ -0,0 +1,162 @@
+"""
+Shared building blocks for the MicroCrop Insurance Smart Contracts
+The base and enhanced (KYC) contracts assemble their approval programs from these
+"""
+
+from functools import lru_cache
+from pyteal import *
+
+# Compile settings shared by compile.py and the standalone contract builds
+TEAL_VERSION = 10
+# Pool repeated literals into intcblock/bytecblock slots
+ASSEMBLE_CONSTANTS = True
+# Scratch slot optimization folds redundant store/load pairs emitted by Seq/Subroutine;
+# frame pointers pass subroutine arguments with proto/frame_dig instead of scratch
+OPTIMIZE = OptimizeOptions(scratch_slots=True, frame_pointers=True)
+
+# Global state keys
+TOTAL_POLICIES = Bytes("total_policies")
+TOTAL_CLAIMS = Bytes("total_claims")
+TOTAL_PAYOUTS = Bytes("total_payouts")
+ORACLE_ADDRESS = Bytes("oracle_address")
+CONTRACT_ADMIN = Bytes("contract_admin")
+KYC_REQUIRED = Bytes("kyc_required")
+MINIMUM_COVERAGE = Bytes("min_coverage")
+MAXIMUM_COVERAGE = Bytes("max_coverage")
+
+# Local state keys
+ACTIVE_POLICIES = Bytes("active_policies")
+TOTAL_COVERAGE = Bytes("total_coverage")
+KYC_STATUS = Bytes("kyc_status")
+RISK_SCORE = Bytes("risk_score")
+
+# Transaction types (one-byte action codes clients pass as application_args[0])
+CREATE_POLICY = 0x01
+CLAIM_PAYOUT = 0x02
+UPDATE_ORACLE = 0x03
+SUBMIT_KYC = 0x04
+APPROVE_KYC = 0x05
+UPDATE_RISK_SCORE = 0x06
+EMERGENCY_PAUSE = 0x07
+
+# Shared integer literals
+_INT = {n: Int(n) for n in (
+    0, 1, 2, 3, 4, 5, 8, 10, 30, 32, 50, 70,
+    100, 180, 365, 1000, 5000, 100000, 1000000,
+)}
+
+def compile_teal(program: Expr) -> str:
+    """Compile an application program with the shared settings"""
+    return compileTeal(
+        program,
+        Mode.Application,
+        version=TEAL_VERSION,
+        assembleConstants=ASSEMBLE_CONSTANTS,
+        optimize=OPTIMIZE,
+    )
+
+def policy_asset_authorities() -> dict:
+    """Asset config fields that make the application every authority of a policy token"""
+    # The address is read in place on purpose: a scratch load costs the same single opcode
+    # as the global read, so caching it would only add the store
+    return {
+        TxnField.config_asset_manager: Global.current_application_address(),
+        TxnField.config_asset_reserve: Global.current_application_address(),
+        TxnField.config_asset_freeze: Global.current_application_address(),
+        TxnField.config_asset_clawback: Global.current_application_address(),
+    }
+
+@Subroutine(TealType.none)
+def transfer_policy(asset_id: Expr, recipient: Expr) -> Expr:
+    """Transfer policy token to policy holder"""
+    return Seq([
+        InnerTxnBuilder.Begin(),
+        InnerTxnBuilder.SetFields({
+            TxnField.type_enum: TxnType.AssetTransfer,
+            TxnField.xfer_asset: asset_id,
+            TxnField.asset_amount: _INT[1],
+            TxnField.asset_receiver: recipient,
+            TxnField.asset_sender: Global.current_application_address(),
+        }),
+        InnerTxnBuilder.Submit(),
+    ])
+
+@Subroutine(TealType.none)
+def process_payout(policy_holder: Expr, payout_amount: Expr) -> Expr:
+    """Process insurance payout to policy holder"""
+    return Seq([
+        # Transfer Algos to policy holder
+        InnerTxnBuilder.Begin(),
+        InnerTxnBuilder.SetFields({
+            TxnField.type_enum: TxnType.Payment,
+            TxnField.amount: payout_amount,
+            TxnField.receiver: policy_holder,
+        }),
+        InnerTxnBuilder.Submit(),
+
+        # Update global statistics
+        App.globalPut(TOTAL_CLAIMS, App.globalGet(TOTAL_CLAIMS) + _INT[1]),
+        App.globalPut(TOTAL_PAYOUTS, App.globalGet(TOTAL_PAYOUTS) + payout_amount),
+    ])
+
+@lru_cache(maxsize=None)
+def make_on_create(kyc_enabled: bool) -> Expr:
+    """Handle application creation"""
+    state = [
+        App.globalPut(TOTAL_POLICIES, _INT[0]),
+        App.globalPut(TOTAL_CLAIMS, _INT[0]),
+        App.globalPut(TOTAL_PAYOUTS, _INT[0]),
+        App.globalPut(ORACLE_ADDRESS, Txn.sender()),
+    ]
+    if kyc_enabled:
+        state += [
+            App.globalPut(CONTRACT_ADMIN, Txn.sender()),
+            App.globalPut(KYC_REQUIRED, _INT[1]),  # KYC required by default
+            App.globalPut(MINIMUM_COVERAGE, _INT[100]),  # 100 ALGO minimum
+            App.globalPut(MAXIMUM_COVERAGE, _INT[100000]),  # 100,000 ALGO maximum
+        ]
+    return Seq(state + [Approve()])
+
+@lru_cache(maxsize=None)
+def make_on_opt_in(kyc_enabled: bool) -> Expr:
+    """Handle opt-in (farmer registration)"""
+    state = [
+        App.localPut(Txn.sender(), ACTIVE_POLICIES, _INT[0]),
+        App.localPut(Txn.sender(), TOTAL_COVERAGE, _INT[0]),
+    ]
+    if kyc_enabled:
+        state += [
+            App.localPut(Txn.sender(), KYC_STATUS, _INT[0]),  # 0 = not submitted, 1 = pending, 2 = approved
+            App.localPut(Txn.sender(), RISK_SCORE, _INT[50]),  # Default medium risk
+        ]
+    return Seq(state + [Approve()])
+
+# Handlers routed by make_dispatch read Txn.application_args and Txn.accounts directly:
+# reading a missing entry already fails the call, so they assert no lengths. Values used
+# more than once are stored in scratch first. The 32-byte policy metadata hash is hashed
+# by the client and only its length is checked on-chain, which saves the sha256.
+def make_dispatch(actions: dict) -> Expr:
+    """Route application calls to their handler by action code using a binary search"""
+    action = ScratchVar(TealType.uint64)
+    codes = sorted(actions)
+    assert codes == list(range(1, len(codes) + 1)), "action codes must be contiguous from 1"
+
+    def branch(lo: int, hi: int) -> Expr:
+        if hi - lo == 1:
+            return actions[codes[lo]]
+        mid = (lo + hi) // 2
+        return If(action.load() < Int(codes[mid]), branch(lo, mid), branch(mid, hi))
+
+    return Seq([
+        # Decode the action once; a call without arguments maps to the invalid code 0
+        action.store(If(
+            Txn.application_args.length() > _INT[0],
+            Btoi(Txn.application_args[0]),
+            _INT[0],
+        )),
+
+        # Unknown actions are rejected up front so the search needs no equality checks
+        Assert(action.load() >= _INT[1]),
+        Assert(action.load() <= Int(codes[-1])),
+        branch(0, len(codes)),
+    ])
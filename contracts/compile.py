@@ -2,35 +2,107 @@
 Contract compilation script for MicroCrop Insurance
 """
 
+import hashlib
+import importlib
+import multiprocessing
 import os
+import re
 import sys
-from pyteal import *
+import time
+from concurrent.futures import ProcessPoolExecutor
+from importlib.metadata import version
 
-def compile_contract():
-    """Compile the insurance smart contract"""
+from _common import compile_teal
+
+# Builders shared by every contract variant
+COMMON_SOURCE = "contracts/_common.py"
+CACHE_DIR = "contracts/build/.cache"
+
+# Output name, contract module and program builder for every compiled program
+PROGRAMS = [
+    ("approval", "insurance_contract", "approval_program"),
+    ("clear", "insurance_contract", "clear_state_program"),
+    ("enhanced_approval", "enhanced_insurance_contract", "approval_program"),
+    ("enhanced_clear", "enhanced_insurance_contract", "clear_state_program"),
+]
+
+def pyteal_version():
+    """PyTeal version with volatile local/dev suffixes stripped"""
+    return re.match(r"\d+(\.\d+)*", version("pyteal")).group(0)
+
+def contract_source(module_name):
+    """Source file of a contract module"""
+    return f"contracts/{module_name}.py"
+
+def cache_key(module_name):
+    """Content hash of a contract's sources and the PyTeal version"""
+    # The compile settings live in _common.py, so its bytes already cover them
+    digest = hashlib.blake2b()
+    for path in (COMMON_SOURCE, contract_source(module_name)):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    digest.update(pyteal_version().encode())
+    return digest.hexdigest()[:16]
+
+def write_atomic(path, data):
+    """Write bytes to a temp file and rename it over path so readers never see a partial file"""
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def prune_cache(name, keep_path):
+    """Remove cached builds of a program other than the current one"""
+    for entry in os.listdir(CACHE_DIR):
+        path = f"{CACHE_DIR}/{entry}"
+        if entry.split(".", 1)[-1] == f"{name}.teal" and path != keep_path:
+            os.remove(path)
+
+def compile_program(module_name, program_name):
+    """Compile a single program; runs in a spawned worker process"""
+    # PyTeal ASTs are not picklable, so each worker imports the contract and builds its own
+    module = importlib.import_module(module_name)
+    return compile_teal(getattr(module, program_name)())
+
+def compile_contract(module_names=None):
+    """Compile the base and enhanced insurance smart contracts, or only the given ones"""
     try:
-        # Import the contract
-        from insurance_contract import approval_program, clear_state_program
+        # Creates contracts/build along with the cache directory
+        os.makedirs(CACHE_DIR, exist_ok=True)
         
-        # Compile approval program
-        approval_teal = compileTeal(approval_program(), Mode.Application, version=8)
+        programs = [p for p in PROGRAMS if module_names is None or p[1] in module_names]
+        keys = {module_name: cache_key(module_name) for _, module_name, _ in programs}
+        cached = {name: f"{CACHE_DIR}/{keys[module_name]}.{name}.teal" for name, module_name, _ in programs}
         
-        # Compile clear state program  
-        clear_teal = compileTeal(clear_state_program(), Mode.Application, version=8)
+        # Compile only programs whose sources or PyTeal version changed
+        stale = [p for p in programs if not os.path.exists(cached[p[0]])]
+        if stale:
+            # Programs share no state, so compile them in parallel processes; spawned workers
+            # import the contracts fresh instead of inheriting the parent's (possibly stale) modules
+            with ProcessPoolExecutor(
+                max_workers=min(len(stale), os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as pool:
+                futures = {
+                    name: pool.submit(compile_program, module_name, program_name)
+                    for name, module_name, program_name in stale
+                }
+                for name, future in futures.items():
+                    write_atomic(cached[name], future.result().encode("utf-8"))
+                    prune_cache(name, cached[name])
         
-        # Create contracts directory if it doesn't exist
-        os.makedirs("contracts/build", exist_ok=True)
+        for module_name, key in keys.items():
+            if not any(p[1] == module_name for p in stale):
+                print(f"♻️  Using cached build {key} for {module_name}")
         
         # Write compiled contracts
-        with open("contracts/build/approval.teal", "w") as f:
-            f.write(approval_teal)
-        
-        with open("contracts/build/clear.teal", "w") as f:
-            f.write(clear_teal)
+        for name, path in cached.items():
+            with open(path, "rb") as f:
+                write_atomic(f"contracts/build/{name}.teal", f.read())
         
         print("✅ Contract compiled successfully!")
-        print(f"📁 Approval program: contracts/build/approval.teal")
-        print(f"📁 Clear program: contracts/build/clear.teal")
+        for name in cached:
+            print(f"📁 {name}: contracts/build/{name}.teal")
         
         return True
         
@@ -38,6 +110,36 @@ def compile_contract():
         print(f"❌ Compilation failed: {str(e)}")
         return False
 
+def watch(interval=0.2):
+    """Recompile a contract whenever its source, or the shared builders, change on disk"""
+    module_names = sorted({module_name for _, module_name, _ in PROGRAMS})
+    paths = [COMMON_SOURCE] + [contract_source(m) for m in module_names]
+    mtimes = {}
+    
+    print("👀 Watching contract sources for changes...")
+    while True:
+        changed = []
+        for path in paths:
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                # Editors that save by rename leave the file briefly missing; retry next poll
+                continue
+            if mtime != mtimes.get(path):
+                mtimes[path] = mtime
+                changed.append(path)
+        if changed:
+            if COMMON_SOURCE in changed:
+                compile_contract()
+            else:
+                compile_contract([m for m in module_names if contract_source(m) in changed])
+        time.sleep(interval)
+
 if __name__ == "__main__":
+    if "--watch" in sys.argv[1:]:
+        try:
+            watch()
+        except KeyboardInterrupt:
+            sys.exit(0)
     success = compile_contract()
     sys.exit(0 if success else 1)
\ No newline at end of file
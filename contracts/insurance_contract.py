@@ -3,134 +3,87 @@ MicroCrop Insurance Smart Contract (Simplified - No KYC)
 Handles policy creation, ASA minting, and payout logic on Algorand
 """
 
+from functools import lru_cache
+from pathlib import Path
 from pyteal import *
 
+from _common import (
+    _INT,
+    ACTIVE_POLICIES,
+    CLAIM_PAYOUT,
+    CREATE_POLICY,
+    ORACLE_ADDRESS,
+    TOTAL_COVERAGE,
+    TOTAL_POLICIES,
+    UPDATE_ORACLE,
+    compile_teal,
+    make_dispatch,
+    make_on_create,
+    make_on_opt_in,
+    policy_asset_authorities,
+    process_payout,
+    transfer_policy,
+)
+
+@Subroutine(TealType.uint64)
+def create_policy_asa(crop_type: Expr, policy_metadata_hash: Expr) -> Expr:
+    """Create an ASA representing an insurance policy"""
+    return Seq([
+        # Create ASA with policy metadata
+        InnerTxnBuilder.Begin(),
+        InnerTxnBuilder.SetFields({
+            TxnField.type_enum: TxnType.AssetConfig,
+            TxnField.config_asset_total: _INT[1],  # Single policy token
+            TxnField.config_asset_decimals: _INT[0],
+            TxnField.config_asset_unit_name: Bytes("POLICY"),
+            TxnField.config_asset_name: Concat(Bytes("CropInsurance-"), crop_type),
+            TxnField.config_asset_url: Bytes("https://microcrop.insurance/policy/"),
+            TxnField.config_asset_metadata_hash: policy_metadata_hash,
+            **policy_asset_authorities(),
+        }),
+        InnerTxnBuilder.Submit(),
+        InnerTxn.created_asset_id()
+    ])
+
+@lru_cache(maxsize=1)
 def approval_program():
     """Main approval program for the insurance contract"""
     
-    # Global state keys
-    TOTAL_POLICIES = Bytes("total_policies")
-    TOTAL_CLAIMS = Bytes("total_claims")
-    TOTAL_PAYOUTS = Bytes("total_payouts")
-    ORACLE_ADDRESS = Bytes("oracle_address")
-    
-    # Local state keys
-    ACTIVE_POLICIES = Bytes("active_policies")
-    TOTAL_COVERAGE = Bytes("total_coverage")
+    # Handle application creation and opt-in (farmer registration)
+    on_create = make_on_create(kyc_enabled=False)
+    on_opt_in = make_on_opt_in(kyc_enabled=False)
     
-    # Transaction types
-    CREATE_POLICY = Bytes("create_policy")
-    CLAIM_PAYOUT = Bytes("claim_payout")
-    UPDATE_ORACLE = Bytes("update_oracle")
-    
-    @Subroutine(TealType.uint64)
-    def create_policy_asa(crop_type: Expr, coverage_amount: Expr, start_date: Expr, end_date: Expr) -> Expr:
-        """Create an ASA representing an insurance policy"""
-        return Seq([
-            # Create ASA with policy metadata
-            InnerTxnBuilder.Begin(),
-            InnerTxnBuilder.SetFields({
-                TxnField.type_enum: TxnType.AssetConfig,
-                TxnField.config_asset_total: Int(1),  # Single policy token
-                TxnField.config_asset_decimals: Int(0),
-                TxnField.config_asset_unit_name: Bytes("POLICY"),
-                TxnField.config_asset_name: Concat(Bytes("CropInsurance-"), crop_type),
-                TxnField.config_asset_url: Bytes("https://microcrop.insurance/policy/"),
-                TxnField.config_asset_metadata_hash: Sha256(
-                    Concat(
-                        crop_type,
-                        Itob(coverage_amount),
-                        Itob(start_date),
-                        Itob(end_date)
-                    )
-                ),
-                TxnField.config_asset_manager: Global.current_application_address(),
-                TxnField.config_asset_reserve: Global.current_application_address(),
-                TxnField.config_asset_freeze: Global.current_application_address(),
-                TxnField.config_asset_clawback: Global.current_application_address(),
-            }),
-            InnerTxnBuilder.Submit(),
-            InnerTxn.created_asset_id()
-        ])
-    
-    @Subroutine(TealType.none)
-    def transfer_policy_to_farmer(asset_id: Expr, farmer_address: Expr) -> Expr:
-        """Transfer policy ASA to farmer's address"""
-        return Seq([
-            InnerTxnBuilder.Begin(),
-            InnerTxnBuilder.SetFields({
-                TxnField.type_enum: TxnType.AssetTransfer,
-                TxnField.xfer_asset: asset_id,
-                TxnField.asset_amount: Int(1),
-                TxnField.asset_receiver: farmer_address,
-                TxnField.asset_sender: Global.current_application_address(),
-            }),
-            InnerTxnBuilder.Submit(),
-        ])
-    
-    @Subroutine(TealType.none)
-    def process_payout(policy_holder: Expr, payout_amount: Expr) -> Expr:
-        """Process insurance payout to policy holder"""
-        return Seq([
-            # Transfer Algos to policy holder
-            InnerTxnBuilder.Begin(),
-            InnerTxnBuilder.SetFields({
-                TxnField.type_enum: TxnType.Payment,
-                TxnField.amount: payout_amount,
-                TxnField.receiver: policy_holder,
-            }),
-            InnerTxnBuilder.Submit(),
-            
-            # Update global state
-            App.globalPut(TOTAL_CLAIMS, App.globalGet(TOTAL_CLAIMS) + Int(1)),
-            App.globalPut(TOTAL_PAYOUTS, App.globalGet(TOTAL_PAYOUTS) + payout_amount),
-        ])
-    
-    # Handle application creation
-    on_create = Seq([
-        App.globalPut(TOTAL_POLICIES, Int(0)),
-        App.globalPut(TOTAL_CLAIMS, Int(0)),
-        App.globalPut(TOTAL_PAYOUTS, Int(0)),
-        App.globalPut(ORACLE_ADDRESS, Txn.sender()),
-        Approve(),
-    ])
-    
-    # Handle opt-in (farmer registration)
-    on_opt_in = Seq([
-        App.localPut(Txn.sender(), ACTIVE_POLICIES, Int(0)),
-        App.localPut(Txn.sender(), TOTAL_COVERAGE, Int(0)),
-        Approve(),
-    ])
+    # Scratch for create_policy values
+    coverage_amount = ScratchVar(TealType.uint64)
+    policy_metadata_hash = ScratchVar(TealType.bytes)
+    farmer_address = ScratchVar(TealType.bytes)
+    policy_holder = ScratchVar(TealType.bytes)
     
     # Handle policy creation (simplified without KYC)
     on_create_policy = Seq([
         # Validate inputs
-        Assert(Txn.application_args.length() == Int(5)),
-        Assert(Txn.accounts.length() == Int(1)),  # Farmer address
         Assert(Gtxn[0].type_enum() == TxnType.Payment),  # Premium payment
         
         # Extract parameters
-        crop_type := Txn.application_args[1],
-        coverage_amount := Btoi(Txn.application_args[2]),
-        start_date := Btoi(Txn.application_args[3]),
-        end_date := Btoi(Txn.application_args[4]),
-        farmer_address := Txn.accounts[1],
-        premium_paid := Gtxn[0].amount(),
+        coverage_amount.store(Btoi(Txn.application_args[2])),
+        # args[3] and args[4] carry the start/end dates, which are not read on-chain
+        policy_metadata_hash.store(Txn.application_args[5]),
+        farmer_address.store(Txn.accounts[1]),
         
         # Validate premium amount (should be percentage of coverage)
-        expected_premium := coverage_amount / Int(10),  # 10% premium rate
-        Assert(premium_paid >= expected_premium),
-        
-        # Create policy ASA
-        policy_asset_id := create_policy_asa(crop_type, coverage_amount, start_date, end_date),
+        Assert(Gtxn[0].amount() >= coverage_amount.load() / _INT[10]),  # 10% premium rate
+        Assert(Len(policy_metadata_hash.load()) == _INT[32]),
         
-        # Transfer policy to farmer
-        transfer_policy_to_farmer(policy_asset_id, farmer_address),
+        # Create policy ASA and transfer it to the farmer
+        transfer_policy(
+            create_policy_asa(Txn.application_args[1], policy_metadata_hash.load()),  # Crop type
+            farmer_address.load()
+        ),
         
         # Update state
-        App.globalPut(TOTAL_POLICIES, App.globalGet(TOTAL_POLICIES) + Int(1)),
-        App.localPut(farmer_address, ACTIVE_POLICIES, App.localGet(farmer_address, ACTIVE_POLICIES) + Int(1)),
-        App.localPut(farmer_address, TOTAL_COVERAGE, App.localGet(farmer_address, TOTAL_COVERAGE) + coverage_amount),
+        App.globalPut(TOTAL_POLICIES, App.globalGet(TOTAL_POLICIES) + _INT[1]),
+        App.localPut(farmer_address.load(), ACTIVE_POLICIES, App.localGet(farmer_address.load(), ACTIVE_POLICIES) + _INT[1]),
+        App.localPut(farmer_address.load(), TOTAL_COVERAGE, App.localGet(farmer_address.load(), TOTAL_COVERAGE) + coverage_amount.load()),
         
         Approve(),
     ])
@@ -139,17 +92,15 @@ def approval_program():
     on_claim_payout = Seq([
         # Only oracle can trigger payouts
         Assert(Txn.sender() == App.globalGet(ORACLE_ADDRESS)),
-        Assert(Txn.application_args.length() == Int(3)),
+        Assert(Txn.application_args.length() == _INT[3]),  # args[2] is the weather data hash
         
-        policy_holder := Txn.accounts[1],
-        payout_amount := Btoi(Txn.application_args[1]),
-        weather_data_hash := Txn.application_args[2],
+        policy_holder.store(Txn.accounts[1]),
         
         # Validate policy holder is opted in
-        Assert(App.localGet(policy_holder, ACTIVE_POLICIES) > Int(0)),
+        Assert(App.localGet(policy_holder.load(), ACTIVE_POLICIES) > _INT[0]),
         
         # Process payout
-        process_payout(policy_holder, payout_amount),
+        process_payout(policy_holder.load(), Btoi(Txn.application_args[1])),
         
         Approve(),
     ])
@@ -157,35 +108,34 @@ def approval_program():
     # Handle oracle address update
     on_update_oracle = Seq([
         Assert(Txn.sender() == Global.creator_address()),
-        Assert(Txn.application_args.length() == Int(2)),
         App.globalPut(ORACLE_ADDRESS, Txn.application_args[1]),
         Approve(),
     ])
     
     # Main program logic
     program = Cond(
-        [Txn.application_id() == Int(0), on_create],
-        [Txn.on_completion() == OnCall.OptIn, on_opt_in],
-        [Txn.application_args[0] == CREATE_POLICY, on_create_policy],
-        [Txn.application_args[0] == CLAIM_PAYOUT, on_claim_payout],
-        [Txn.application_args[0] == UPDATE_ORACLE, on_update_oracle],
+        [Txn.application_id() == _INT[0], on_create],
+        [Txn.on_completion() == OnComplete.OptIn, on_opt_in],
+        [_INT[1], make_dispatch({
+            CREATE_POLICY: on_create_policy,
+            CLAIM_PAYOUT: on_claim_payout,
+            UPDATE_ORACLE: on_update_oracle,
+        })],
     )
     
     return program
 
+@lru_cache(maxsize=1)
 def clear_state_program():
     """Clear state program - always approve"""
     return Approve()
 
 if __name__ == "__main__":
     # Compile the contract
-    approval_teal = compileTeal(approval_program(), Mode.Application, version=8)
-    clear_teal = compileTeal(clear_state_program(), Mode.Application, version=8)
-    
-    with open("approval.teal", "w") as f:
-        f.write(approval_teal)
+    approval_teal = compile_teal(approval_program())
+    clear_teal = compile_teal(clear_state_program())
     
-    with open("clear.teal", "w") as f:
-        f.write(clear_teal)
+    Path("approval.teal").write_bytes(approval_teal.encode("utf-8"))
+    Path("clear.teal").write_bytes(clear_teal.encode("utf-8"))
     
     print("Contract compiled successfully!")
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+Smoke tests for MicroCrop Insurance contract compilation
+"""
+
+import os
+import re
+import shutil
+import sys
+
+import pytest
+
+CONTRACTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(CONTRACTS_DIR)
+sys.path.insert(0, CONTRACTS_DIR)
+
+import _common
+import compile as contract_compile
+
+@pytest.mark.parametrize("name, module_name, program_name", contract_compile.PROGRAMS)
+def test_program_compiles(name, module_name, program_name):
+    """Every program built by compile.py lowers to TEAL"""
+    teal = contract_compile.compile_program(module_name, program_name)
+    assert teal.startswith("#pragma version")
+
+def test_rebuild_picks_up_common_changes(tmp_path, monkeypatch):
+    """Editing the shared builders between builds in one process changes the output"""
+    contracts = tmp_path / "contracts"
+    shutil.copytree(CONTRACTS_DIR, contracts, ignore=shutil.ignore_patterns("build", "tests", "__pycache__"))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(contracts))
+
+    assert contract_compile.compile_contract()
+    before = (contracts / "build" / "approval.teal").read_bytes()
+
+    common = contracts / "_common.py"
+    common.write_text(common.read_text().replace('Bytes("total_policies")', 'Bytes("policy_count")'))
+    assert contract_compile.compile_contract()
+    after = (contracts / "build" / "approval.teal").read_bytes()
+
+    assert after != before
+    key = contract_compile.cache_key("insurance_contract")
+    assert (contracts / "build" / ".cache" / f"{key}.approval.teal").read_bytes() == after
+
+@pytest.mark.parametrize("path", [
+    "backend/services/AlgorandService.js",
+    "src/hooks/useInsuranceContract.ts",
+])
+def test_client_action_codes_match_contract(path):
+    """Clients send the same one-byte action codes the contract dispatches on"""
+    with open(os.path.join(REPO_DIR, path)) as f:
+        source = f.read()
+    block = re.search(r"const CONTRACT_ACTIONS = \{(.*?)\}", source, re.S).group(1)
+    codes = dict(re.findall(r"(\w+): (0x[0-9a-fA-F]+)", block))
+    assert codes
+    for action, code in codes.items():
+        assert int(code, 16) == getattr(_common, action)
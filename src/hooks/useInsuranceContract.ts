@@ -6,6 +6,12 @@
 import { useState, useCallback } from 'react';
 import algosdk from 'algosdk';
 import { useAlgorand } from './useAlgorand';
+import { CryptoUtils } from '../utils/cryptoUtils';
+
+// Contract action codes (contracts/_common.py)
+const CONTRACT_ACTIONS = {
+  CREATE_POLICY: 0x01
+} as const;
 
 interface ContractState {
   totalPolicies: number;
@@ -118,20 +124,30 @@ export const useInsuranceContract = (contractId: number) => {
         suggestedParams
       });
 
+      // Policy metadata hash
+      const metadataHash = CryptoUtils.createPolicyHash({
+        holder: currentAccount,
+        coverageType: params.coverageType,
+        amount: params.coverageAmount,
+        duration: params.duration,
+        timestamp: Math.floor(Date.now() / 1000)
+      });
+
       // Create application call transaction (simplified without KYC)
       const appCallTxn = algosdk.makeApplicationCallTxnFromObject({
         from: currentAccount,
         appIndex: contractId,
         onComplete: algosdk.OnApplicationComplete.NoOpOC,
         appArgs: [
-          new Uint8Array(Buffer.from('create_policy')),
+          new Uint8Array([CONTRACT_ACTIONS.CREATE_POLICY]),
           new Uint8Array(Buffer.from(params.coverageType)),
           algosdk.encodeUint64(params.coverageAmount * 1000000), // Convert to microAlgos
           algosdk.encodeUint64(params.duration),
           algosdk.encodeUint64(params.deductible * 1000000), // Convert to microAlgos
           algosdk.encodeUint64(params.locationRisk),
           algosdk.encodeUint64(params.age),
-          algosdk.encodeUint64(params.historicalClaims)
+          algosdk.encodeUint64(params.historicalClaims),
+          new Uint8Array(Buffer.from(metadataHash, 'hex'))
         ],
         accounts: [currentAccount],
         suggestedParams